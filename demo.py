@@ -1,81 +1,99 @@
 """Demonstration and testing of the JaCoCo Test Generator."""
 
+import sys
+
 from jacoco_test_generator.coverage_parser import JaCoCoParser
 from jacoco_test_generator.test_generator import JavaTestGenerator
 
 
+RULE = "=" * 70
+THIN_RULE = "-" * 70
+
+
+def write_section(lines):
+    """Write a block of output lines with a single write call."""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
 def demo():
     """Run a demonstration of the test generator."""
     
-    print("=" * 70)
-    print("JaCoCo Test Generator - Demo")
-    print("=" * 70)
-    
     # Using the example report
     report_path = "assignment3_jacoco_report.xml"
     
-    print(f"\n1. Parsing coverage report: {report_path}")
-    print("-" * 70)
+    write_section([
+        RULE,
+        "JaCoCo Test Generator - Demo",
+        RULE,
+        f"\n1. Parsing coverage report: {report_path}",
+        THIN_RULE,
+    ])
     
-    try:
-        report = JaCoCoParser.parse_report(report_path)
-        
-        print(f"\nCoverage Summary:")
-        print(f"  Line Coverage:      {report.total_line_coverage:.2f}%")
-        print(f"  Branch Coverage:    {report.total_branch_coverage:.2f}%")
-        print(f"  Methods with gaps:  {len(report.gaps)}")
-        
-        print(f"\nTop 5 Coverage Gaps:")
-        for i, gap in enumerate(report.gaps[:5], 1):
-            print(f"\n  {i}. {gap.class_name}.{gap.method_name}")
-            print(f"     Line Coverage:    {gap.line_coverage:.2f}%")
-            print(f"     Branch Coverage:  {gap.branch_coverage:.2f}%")
-            print(f"     Uncovered lines:  {gap.uncovered_lines}")
-        
-        print("\n" + "=" * 70)
-        print("2. Generating test cases")
-        print("-" * 70)
-        
-        tests = JavaTestGenerator.generate_tests(report.gaps, max_tests_per_gap=2)
-        
-        print(f"\nGenerated {len(tests)} test cases")
-        
-        print("\nSample Generated Tests:")
-        for i, test in enumerate(tests[:3], 1):
-            print(f"\n  Test {i}: {test.class_name}.{test.test_method_name}")
-            print(f"  Target: {test.target_class}.{test.target_method}")
-            print("\n  Code:")
-            for line in test.test_code.split("\n"):
-                print(f"    {line}")
-        
-        print("\n" + "=" * 70)
-        print("3. Formatting complete test file")
-        print("-" * 70)
-        
-        # Formatting first test file
-        target_gap = report.gaps[0]
-        gap_tests = [t for t in tests if t.target_class == target_gap.class_name]
-        
-        if gap_tests:
-            test_class_name = gap_tests[0].class_name
-            package_name = target_gap.package_name
-            
-            test_file = JavaTestGenerator.format_test_file(test_class_name, package_name, gap_tests)
-            
-            print(f"\nGenerated test file: {package_name}.test.{test_class_name}")
-            print("\nFirst 50 lines:")
-            lines = test_file.split("\n")[:50]
-            for line in lines:
-                print(line)
+    # Only the 10 lowest-covered gaps are shown or turned into tests
+    report = JaCoCoParser.parse_report(report_path, top_k=10)
+    
+    section = [
+        "\nCoverage Summary:",
+        f"  Line Coverage:      {report.total_line_coverage:.2f}%",
+        f"  Branch Coverage:    {report.total_branch_coverage:.2f}%",
+        f"  Methods with gaps:  {report.total_gaps}",
+        "\nTop 5 Coverage Gaps:",
+    ]
+    for i, gap in enumerate(report.gaps[:5], 1):
+        section += [
+            f"\n  {i}. {gap.class_name}.{gap.method_name}",
+            f"     Line Coverage:    {gap.line_coverage:.2f}%",
+            f"     Branch Coverage:  {gap.branch_coverage:.2f}%",
+            f"     Uncovered lines:  {gap.uncovered_lines_list}",
+        ]
+    write_section(section)
+    
+    tests = JavaTestGenerator.generate_tests(report.gaps, max_tests_per_gap=2)
+    
+    section = [
+        "\n" + RULE,
+        "2. Generating test cases",
+        THIN_RULE,
+        f"\nGenerated {len(tests)} test cases",
+        "\nSample Generated Tests:",
+    ]
+    for i, test in enumerate(tests[:3], 1):
+        section += [
+            f"\n  Test {i}: {test.class_name}.{test.test_method_name}",
+            f"  Target: {test.target_class}.{test.target_method}",
+            "\n  Code:",
+        ]
+        section += [f"    {line}" for line in test.test_code.split("\n")]
+    write_section(section)
+    
+    section = [
+        "\n" + RULE,
+        "3. Formatting complete test file",
+        THIN_RULE,
+    ]
+    
+    # Formatting first test file
+    target_gap = report.gaps[0]
+    gap_tests = [t for t in tests if t.target_class == target_gap.class_name]
+    
+    if gap_tests:
+        test_class_name = gap_tests[0].class_name
+        package_name = target_gap.package_name
         
-        print("\n" + "=" * 70)
-        print("Demo Complete!")
-        print("=" * 70)
+        test_file = JavaTestGenerator.format_test_file(test_class_name, package_name, gap_tests)
         
-    except Exception as e:
-        print(f"Error: {e}")
-        import traceback
-        traceback.print_exc()
+        section += [
+            f"\nGenerated test file: {package_name}.test.{test_class_name}",
+            "\nFirst 50 lines:",
+        ]
+        section += test_file.split("\n", 50)[:50]
+    
+    section += [
+        "\n" + RULE,
+        "Demo Complete!",
+        RULE,
+    ]
+    write_section(section)
 
 
 if __name__ == "__main__":
@@ -1,135 +1,355 @@
 """Parse JaCoCo coverage reports and extract coverage information."""
 
-import xml.etree.ElementTree as ET
+import functools
+import heapq
+import xml.sax
+from array import array
 from dataclasses import dataclass
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 
+try:
+    from lxml import etree as ET
+    HAS_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    HAS_LXML = False
+
+
+# The only elements parse events are needed for; counters and lines are read
+# from their parent. lxml can filter the rest out before they reach Python.
+_ITERPARSE_TAGS = ("report", "package", "class", "method")
+
+
+@functools.lru_cache(maxsize=4096)
+def _method_base(method_name: str) -> str:
+    """Method name without its JVM descriptor, e.g. "add(II)I" -> "add"."""
+    return method_name.split("(", 1)[0]
+
 
 @dataclass
 class CoverageGap:
     """Represents a method or class with incomplete coverage."""
+    # Declared by hand rather than dataclass(slots=True), which needs Python 3.10.
+    # Not frozen: a frozen __init__ is several times slower, and one runs per gap.
+    __slots__ = (
+        "class_name", "method_name", "package_name",
+        "line_coverage", "branch_coverage", "uncovered_lines"
+    )
+    
     class_name: str
     method_name: Optional[str]
     package_name: str
     line_coverage: float  # percentage 0-100
     branch_coverage: float  # percentage 0-100
-    uncovered_lines: List[int]
+    uncovered_lines: array  # unsigned ints ("I"), 4 bytes per line number
+    
+    @property
+    def method_base(self) -> str:
+        """Method name without its signature (memoized per name)."""
+        return _method_base(self.method_name)
+    
+    @property
+    def uncovered_lines_list(self) -> List[int]:
+        """Uncovered line numbers as a plain list."""
+        return self.uncovered_lines.tolist()
 
 
 @dataclass
 class CoverageReport:
-    """JaCoCo coverage report summary."""
+    """
+    JaCoCo coverage report summary.
+    
+    gaps holds every gap, or only the lowest-covered ones when the report was
+    parsed with top_k; total_gaps always counts all of them.
+    """
+    __slots__ = ("total_line_coverage", "total_branch_coverage", "gaps", "_total_gaps")
+    
     total_line_coverage: float
     total_branch_coverage: float
     gaps: List[CoverageGap]
+    
+    def __post_init__(self):
+        # Not a constructor field (slotted dataclasses cannot have defaults);
+        # parse_report overrides it after truncating gaps
+        self._total_gaps = len(self.gaps)
+    
+    @property
+    def total_gaps(self) -> int:
+        """Number of gaps in the report, including any dropped by top_k."""
+        return self._total_gaps
+    
+    @property
+    def sorted_gaps(self) -> List[CoverageGap]:
+        """Gaps ordered by line coverage (lowest first)."""
+        return sorted(self.gaps, key=lambda g: g.line_coverage)
 
 
 class JaCoCoParser:
     """Parser for JaCoCo XML coverage reports."""
     
     @staticmethod
-    def parse_report(xml_path: str) -> CoverageReport:
+    def parse_report(
+        xml_path: str,
+        streaming: bool = False,
+        top_k: Optional[int] = None
+    ) -> CoverageReport:
         """
         Parse a JaCoCo XML coverage report.
         
         Args:
             xml_path: Path to the JaCoCo XML report file
+            streaming: Use a SAX handler that never builds elements, keeping
+                       memory bounded regardless of report size
+            top_k: Only keep the top_k lowest-covered gaps (default: all)
             
         Returns:
             CoverageReport with coverage summary and gaps
         """
-        tree = ET.parse(xml_path)
-        root = tree.getroot()
+        if streaming:
+            handler = _JaCoCoHandler()
+            xml.sax.parse(xml_path, handler)
+            gaps, root_counts, package_counts = handler.gaps, handler.root_counts, handler.package_counts
+        else:
+            gaps, root_counts, package_counts = JaCoCoParser._parse_tree(xml_path)
+        
+        total_line_coverage, total_branch_coverage = JaCoCoParser._overall_coverage(
+            root_counts, package_counts
+        )
+        total_gaps = len(gaps)
+        
+        # Sort gaps by coverage (lowest first)
+        if top_k is None:
+            gaps.sort(key=lambda g: g.line_coverage)
+        else:
+            gaps = heapq.nsmallest(top_k, gaps, key=lambda g: g.line_coverage)
+        
+        report = CoverageReport(
+            total_line_coverage=total_line_coverage,
+            total_branch_coverage=total_branch_coverage,
+            gaps=gaps
+        )
+        report._total_gaps = total_gaps
+        return report
+    
+    @staticmethod
+    def _parse_tree(xml_path: str) -> Tuple[List[CoverageGap], List[int], List[int]]:
+        """
+        Collect gaps with (lxml) iterparse.
         
+        Args:
+            xml_path: Path to the JaCoCo XML report file
+            
+        Returns:
+            Gaps, root counter counts and summed package counter counts
+            (each as line covered/missed, branch covered/missed)
+        """
         gaps = []
-        total_line_coverage = 0.0
-        total_branch_coverage = 0.0
+        root_counts = [0, 0, 0, 0]
         
-        # Parse packages
-        for package in root.findall(".//package"):
-            package_name = package.get("name", "")
+        # Stream the report instead of building the whole tree; elements are
+        # released as soon as they have been consumed.
+        package_name = ""
+        full_class = ""
+        open_tags = []
+        package_counts = [0, 0, 0, 0]
+        
+        # Bound locally since they run once per method
+        get_counts = JaCoCoParser._get_line_and_branch_counts
+        get_uncovered_lines = JaCoCoParser._get_uncovered_lines
+        percent = JaCoCoParser._percent
+        release = JaCoCoParser._release
+        
+        if HAS_LXML:
+            events = ET.iterparse(xml_path, events=("start", "end"), tag=_ITERPARSE_TAGS)
+        else:
+            events = ET.iterparse(xml_path, events=("start", "end"))
+        
+        for event, elem in events:
+            tag = elem.tag
             
-            # Parse classes
-            for cls in package.findall(".//class"):
-                class_name = cls.get("name", "")
-                full_class = f"{package_name}.{class_name}".replace("/", ".")
-                
-                # Parse methods
-                for method in cls.findall(".//method"):
-                    method_name = method.get("name", "")
-                    signature = method.get("desc", "")
-                    
-                    # Get line and branch coverage
-                    line_coverage = JaCoCoParser._get_coverage_percent(method, "line")
-                    branch_coverage = JaCoCoParser._get_coverage_percent(method, "branch")
-                    
-                    # If not fully covered, add as gap
-                    if line_coverage < 100:
-                        uncovered_lines = JaCoCoParser._get_uncovered_lines(method)
-                        gap = CoverageGap(
-                            class_name=full_class,
-                            method_name=f"{method_name}{signature}",
-                            package_name=package_name,
-                            line_coverage=line_coverage,
-                            branch_coverage=branch_coverage,
-                            uncovered_lines=uncovered_lines
-                        )
-                        gaps.append(gap)
+            if event == "start":
+                if tag == "package":
+                    package_name = elem.get("name", "")
+                elif tag == "class":
+                    class_name = elem.get("name", "")
+                    full_class = f"{package_name}.{class_name}".replace("/", ".")
+                open_tags.append(tag)
+                continue
+            
+            open_tags.pop()
+            
+            if tag == "method":
+                # Get line and branch counts
+                line_covered, line_missed, branch_covered, branch_missed = get_counts(elem)
                 
-                # Also track class-level coverage
-                class_line_coverage = JaCoCoParser._get_coverage_percent(cls, "line")
-                class_branch_coverage = JaCoCoParser._get_coverage_percent(cls, "branch")
+                # If not fully covered, add as gap; covered methods need no further work
+                if line_missed or not line_covered:
+                    method_name = elem.get("name", "")
+                    signature = elem.get("desc", "")
+                    gap = CoverageGap(
+                        class_name=full_class,
+                        method_name=f"{method_name}{signature}",
+                        package_name=package_name,
+                        line_coverage=percent(line_covered, line_missed),
+                        branch_coverage=percent(branch_covered, branch_missed),
+                        uncovered_lines=get_uncovered_lines(elem)
+                    )
+                    gaps.append(gap)
                 
-                if class_line_coverage > total_line_coverage:
-                    total_line_coverage = class_line_coverage
-                if class_branch_coverage > total_branch_coverage:
-                    total_branch_coverage = class_branch_coverage
-        
-        # Get overall coverage
-        for counter in root.findall(".//counter"):
-            counter_type = counter.get("type", "")
+                release(elem)
+            
+            elif tag == "package":
+                # Summed package counters back up reports without root counters
+                counts = get_counts(elem)
+                package_counts = [total + count for total, count in zip(package_counts, counts)]
+                release(elem)
+            
+            elif tag == "class":
+                release(elem)
+            
+            elif not open_tags:
+                # Overall coverage lives in the counters directly under <report>
+                root_counts = list(get_counts(elem))
+        
+        return gaps, root_counts, package_counts
+    
+    @staticmethod
+    def _get_line_and_branch_counts(element) -> Tuple[int, int, int, int]:
+        """Extract (line covered, line missed, branch covered, branch missed) from the counters."""
+        line_covered = line_missed = branch_covered = branch_missed = 0
+        for counter in element:
+            if counter.tag != "counter":
+                continue
+            counter_type = counter.get("type")
             if counter_type == "LINE":
-                covered = int(counter.get("covered", 0))
-                missed = int(counter.get("missed", 0))
-                total = covered + missed
-                if total > 0:
-                    total_line_coverage = (covered / total) * 100
+                line_covered = int(counter.get("covered") or 0)
+                line_missed = int(counter.get("missed") or 0)
             elif counter_type == "BRANCH":
-                covered = int(counter.get("covered", 0))
-                missed = int(counter.get("missed", 0))
-                total = covered + missed
-                if total > 0:
-                    total_branch_coverage = (covered / total) * 100
-        
-        # Sort gaps by coverage (lowest first)
-        gaps.sort(key=lambda g: g.line_coverage)
+                branch_covered = int(counter.get("covered") or 0)
+                branch_missed = int(counter.get("missed") or 0)
+        return line_covered, line_missed, branch_covered, branch_missed
+    
+    @staticmethod
+    def _overall_coverage(root_counts, package_counts) -> Tuple[float, float]:
+        """
+        Overall line and branch coverage from the root counters.
         
-        return CoverageReport(
-            total_line_coverage=total_line_coverage,
-            total_branch_coverage=total_branch_coverage,
-            gaps=gaps
+        Falls back to the summed package counts for a type the root does not report.
+        """
+        line_covered, line_missed, branch_covered, branch_missed = root_counts
+        if line_covered + line_missed == 0:
+            line_covered, line_missed = package_counts[0], package_counts[1]
+        if branch_covered + branch_missed == 0:
+            branch_covered, branch_missed = package_counts[2], package_counts[3]
+        return (
+            JaCoCoParser._percent(line_covered, line_missed),
+            JaCoCoParser._percent(branch_covered, branch_missed)
         )
     
     @staticmethod
-    def _get_coverage_percent(element, counter_type: str) -> float:
-        """Extract coverage percentage for a specific counter type."""
-        for counter in element.findall("counter"):
-            if counter.get("type") == counter_type.upper():
-                covered = int(counter.get("covered", 0))
-                missed = int(counter.get("missed", 0))
-                total = covered + missed
-                if total > 0:
-                    return (covered / total) * 100
-        return 0.0
+    def _percent(covered: int, missed: int) -> float:
+        """Coverage percentage, 0 when there is nothing to cover."""
+        total = covered + missed
+        return (covered / total) * 100 if total > 0 else 0.0
     
     @staticmethod
-    def _get_uncovered_lines(method_element) -> List[int]:
+    def _get_uncovered_lines(method_element) -> array:
         """Extract line numbers that are not covered."""
-        uncovered = []
-        for line in method_element.findall("line"):
-            line_num = int(line.get("nr", 0))
-            ci = int(line.get("ci", 0))  # covered instructions
-            if ci == 0:
-                uncovered.append(line_num)
-        return uncovered
+        _int = int
+        # ci = covered instructions
+        return array("I", [
+            _int(line.get("nr", "0"))
+            for line in method_element.iterfind("line")
+            if _int(line.get("ci", "0")) == 0
+        ])
+    
+    @staticmethod
+    def _release(element) -> None:
+        """Free a consumed element and, with lxml, its already-processed siblings."""
+        element.clear()
+        if HAS_LXML:
+            parent = element.getparent()
+            while element.getprevious() is not None:
+                del parent[0]
+
+
+class _JaCoCoHandler(xml.sax.ContentHandler):
+    """SAX handler that accumulates coverage gaps without building any elements."""
+    
+    def __init__(self):
+        super().__init__()
+        self.gaps: List[CoverageGap] = []
+        self.root_counts = [0, 0, 0, 0]
+        self.package_counts = [0, 0, 0, 0]
+        self._open_tags: List[str] = []
+        self._package_name = ""
+        self._full_class = ""
+        self._method = None
+    
+    def startElement(self, name, attrs):
+        parent = self._open_tags[-1] if self._open_tags else None
+        self._open_tags.append(name)
+        
+        if name == "counter":
+            # Method, package and report counters matter; class counters do not
+            if parent == "method":
+                counts = self._method["counts"]
+            elif parent == "package":
+                counts = self.package_counts
+            elif parent == "report":
+                counts = self.root_counts
+            else:
+                return
+            counter_type = attrs.get("type")
+            if counter_type == "LINE":
+                offset = 0
+            elif counter_type == "BRANCH":
+                offset = 2
+            else:
+                return
+            covered = int(attrs.get("covered") or 0)
+            missed = int(attrs.get("missed") or 0)
+            if parent == "package":
+                counts[offset] += covered
+                counts[offset + 1] += missed
+            else:
+                counts[offset] = covered
+                counts[offset + 1] = missed
+        
+        elif name == "line":
+            if parent == "method" and int(attrs.get("ci", "0")) == 0:
+                self._method["uncovered_lines"].append(int(attrs.get("nr", "0")))
+        
+        elif name == "method":
+            self._method = {
+                "name": f"{attrs.get('name', '')}{attrs.get('desc', '')}",
+                "counts": [0, 0, 0, 0],
+                "uncovered_lines": array("I")
+            }
+        
+        elif name == "class":
+            class_name = attrs.get("name", "")
+            self._full_class = f"{self._package_name}.{class_name}".replace("/", ".")
+        
+        elif name == "package":
+            self._package_name = attrs.get("name", "")
+    
+    def endElement(self, name):
+        self._open_tags.pop()
+        
+        if name == "method":
+            method = self._method
+            line_covered, line_missed, branch_covered, branch_missed = method["counts"]
+            
+            # If not fully covered, add as gap
+            if line_missed or not line_covered:
+                self.gaps.append(CoverageGap(
+                    class_name=self._full_class,
+                    method_name=method["name"],
+                    package_name=self._package_name,
+                    line_coverage=JaCoCoParser._percent(line_covered, line_missed),
+                    branch_coverage=JaCoCoParser._percent(branch_covered, branch_missed),
+                    uncovered_lines=method["uncovered_lines"]
+                ))
+            self._method = None
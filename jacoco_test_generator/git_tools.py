@@ -1,11 +1,179 @@
 """Git operations for automated test generation workflows."""
 
+import functools
 import os
+import re
 import subprocess
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Pattern, Tuple
 from dataclasses import dataclass
 
 
+# Paths per `git add` call when falling back to command-line pathspecs,
+# keeping well under OS argument length limits.
+_GIT_ADD_CHUNK_SIZE = 500
+
+
+# Current branch per repository, keyed by absolute path and stored with the
+# (mtime, size) of .git/HEAD, which git rewrites on every checkout.
+_BRANCH_CACHE: Dict[str, Tuple[Tuple[int, int], str]] = {}
+
+# Summary line printed by `git commit`, e.g. "[main 1a2b3c4] message",
+# "[main (root-commit) 1a2b3c4] message" or "[detached HEAD 1a2b3c4] message".
+_COMMIT_SUMMARY_RE = re.compile(r"^\[.+? ([0-9a-f]{7,})\] ", re.MULTILINE)
+
+
+@functools.lru_cache(maxsize=1)
+def _gh_available() -> bool:
+    """Check once per process whether the GitHub CLI can be run."""
+    try:
+        subprocess.run(
+            ["gh", "--version"],
+            capture_output=True,
+            check=True
+        )
+        return True
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return False
+
+
+def _current_branch(repo_path: str) -> str:
+    """
+    Get the current branch name, reusing the last answer while HEAD is unchanged.
+    
+    Raises:
+        subprocess.CalledProcessError: If git cannot resolve HEAD
+    """
+    key = os.path.abspath(repo_path)
+    try:
+        head_stat = os.stat(os.path.join(repo_path, ".git", "HEAD"))
+        head_state = (head_stat.st_mtime_ns, head_stat.st_size)
+    except OSError:
+        # Worktrees, submodules or bare repos: no cheap way to validate a cache entry
+        head_state = None
+    
+    if head_state is not None:
+        cached = _BRANCH_CACHE.get(key)
+        if cached is not None and cached[0] == head_state:
+            return cached[1]
+    
+    branch_result = subprocess.run(
+        ["git", "rev-parse", "--abbrev-ref", "HEAD"],
+        cwd=repo_path,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    branch = branch_result.stdout.strip()
+    
+    if head_state is not None:
+        _BRANCH_CACHE[key] = (head_state, branch)
+    return branch
+
+
+# Coverage stat lines appended to commit messages and PR bodies: (key, template)
+_COMMIT_STATS_FIELDS = (
+    ("line_coverage", "- Line Coverage: {:.2f}%"),
+    ("branch_coverage", "- Branch Coverage: {:.2f}%"),
+    ("tests_generated", "- Tests Generated: {}"),
+    ("coverage_gap", "- Coverage Gap: {:.2f}%"),
+)
+_PR_STATS_FIELDS = (
+    ("line_coverage", "- Line Coverage: {:.2f}%"),
+    ("branch_coverage", "- Branch Coverage: {:.2f}%"),
+    ("tests_generated", "- Tests Generated: {}"),
+    ("coverage_improvement", "- Coverage Improvement: +{:.2f}%"),
+)
+
+
+def _format_stats(coverage_stats: Dict[str, float], header: str, fields) -> str:
+    """Render a header line followed by one bullet per coverage stat present."""
+    parts = [header]
+    parts += [template.format(coverage_stats[key]) for key, template in fields if key in coverage_stats]
+    return "\n".join(parts)
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """
+    Translate an exclude glob into a regex to search repository paths with.
+    
+    Like .gitignore, "*", "?" and "[...]" never match "/", a pattern without
+    an inner "/" matches a file or directory name at any depth and one with
+    an inner "/" is relative to the repository root; a trailing "/" only
+    matches directories, and a matched directory excludes everything under it.
+    """
+    is_dir = pattern.endswith("/")
+    body = pattern.rstrip("/")
+    
+    parts = []
+    i = 0
+    while i < len(body):
+        char = body[i]
+        if char == "*":
+            parts.append("[^/]*")
+        elif char == "?":
+            parts.append("[^/]")
+        elif char == "[":
+            # A "]" right after "[" (or "[!") is part of the set, as in fnmatch
+            end = body.find("]", i + 3 if body[i + 1:i + 2] == "!" else i + 2)
+            if end == -1:
+                parts.append(re.escape(char))
+            else:
+                chars = body[i + 1:end]
+                if chars.startswith("!"):
+                    chars = "^" + chars[1:]
+                parts.append("(?!/)[" + chars.replace("\\", "\\\\") + "]")
+                i = end
+        else:
+            parts.append(re.escape(char))
+        i += 1
+    
+    anchor = "^" if "/" in body else "(?:^|/)"
+    return anchor + "".join(parts) + ("/" if is_dir else "(?:/|$)")
+
+
+def _compile_exclude_patterns(
+    patterns: List[str]
+) -> Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[str, ...], Optional[Pattern]]:
+    """
+    Sort exclude patterns into categories that can each be checked in one call.
+    
+    Returns (dir_prefixes, suffixes, substrings, glob_regex):
+    plain directory patterns ("target/") become path prefixes, leading-star
+    patterns ("*.class") suffixes, leading-star directory patterns
+    ("*.egg-info/") and plain names (".coverage") substrings, and any other
+    glob is compiled into one combined regex (see _glob_to_regex).
+    """
+    dir_prefixes = []
+    suffixes = []
+    substrings = []
+    regex_parts = []
+    for pattern in patterns:
+        rest = pattern[1:] if pattern.startswith("*") else pattern
+        if any(char in rest for char in "*?["):
+            regex_parts.append(_glob_to_regex(pattern))
+        elif pattern.startswith("*"):
+            if rest.endswith("/"):
+                substrings.append(rest)
+            else:
+                suffixes.append(rest)
+        elif pattern.endswith("/"):
+            dir_prefixes.append(pattern)
+        else:
+            substrings.append(pattern)
+    
+    glob_regex = re.compile("|".join(f"(?:{part})" for part in regex_parts)) if regex_parts else None
+    return tuple(dir_prefixes), tuple(suffixes), tuple(substrings), glob_regex
+
+
+# Default exclusions for git_add_all (build artifacts and temporary files),
+# pre-sorted the same way _compile_exclude_patterns would
+_DEFAULT_DIR = (
+    "target/", "build/", "dist/", "__pycache__/", ".pytest_cache/", ".venv/", "node_modules/"
+)
+_DEFAULT_SUF = (".class", ".jar", ".pyc")
+_DEFAULT_SUB = (".coverage", ".egg-info/")
+
+
 @dataclass
 class GitStatus:
     """Represents the status of a git repository."""
@@ -47,89 +215,102 @@ class GitTools:
             repo_path: Path to git repository
             
         Returns:
-            GitStatus with clean status, staged changes, conflicts
+            GitStatus with clean status, staged changes, conflicts;
+            commits_ahead counts commits ahead of the branch's upstream, or
+            of origin/<branch> when no upstream is configured
             
         Raises:
             RuntimeError: If not a git repository
         """
-        try:
-            # Check if it's a git repo
-            subprocess.run(
-                ["git", "rev-parse", "--git-dir"],
-                cwd=repo_path,
-                capture_output=True,
-                check=True
-            )
-        except subprocess.CalledProcessError:
-            raise RuntimeError(f"{repo_path} is not a git repository")
-        
-        # Get current branch
-        try:
-            branch_result = subprocess.run(
-                ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-                cwd=repo_path,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            current_branch = branch_result.stdout.strip()
-        except subprocess.CalledProcessError:
-            current_branch = "unknown"
-        
-        # Get commits ahead of origin
-        commits_ahead = 0
-        try:
-            ahead_result = subprocess.run(
-                ["git", "rev-list", "--count", f"origin/{current_branch}..HEAD"],
-                cwd=repo_path,
-                capture_output=True,
-                text=True
-            )
-            if ahead_result.returncode == 0:
-                commits_ahead = int(ahead_result.stdout.strip() or 0)
-        except (subprocess.CalledProcessError, ValueError):
-            pass
-        
-        # Get status in porcelain format
+        # Branch, upstream tracking and file status all come from one call.
+        # Output stays as bytes; only the fields that are returned get decoded.
+        # --no-optional-locks keeps status from taking .git/index.lock to
+        # refresh the index, so it cannot make a concurrent add or commit fail.
         status_result = subprocess.run(
-            ["git", "status", "--porcelain"],
+            ["git", "--no-optional-locks", "status", "--porcelain=v2", "--branch"],
             cwd=repo_path,
-            capture_output=True,
-            text=True,
-            check=True
+            capture_output=True
         )
+        if status_result.returncode != 0:
+            # 128 is git's fatal error exit, which "not a git repository" uses;
+            # checked by code because the message is translated
+            if status_result.returncode == 128:
+                raise RuntimeError(f"{repo_path} is not a git repository")
+            raise subprocess.CalledProcessError(
+                status_result.returncode,
+                status_result.args,
+                status_result.stdout,
+                status_result.stderr
+            )
         
+        current_branch = "unknown"
+        commits_ahead = None
         staged_changes = []
         unstaged_changes = []
         untracked_files = []
         conflicts = []
         
-        for line in status_result.stdout.strip().split("\n"):
+        for line in status_result.stdout.split(b"\n"):
             if not line:
                 continue
             
-            status_code = line[:2]
-            filename = line[3:]
+            # Header lines
+            if line.startswith(b"# branch.head "):
+                current_branch = os.fsdecode(line[len(b"# branch.head "):])
+                if current_branch == "(detached)":
+                    current_branch = "HEAD"
+                continue
+            if line.startswith(b"# branch.ab "):
+                try:
+                    commits_ahead = int(line.split()[2].lstrip(b"+"))
+                except (IndexError, ValueError):
+                    pass
+                continue
+            if line.startswith(b"#"):
+                continue
+            
+            # Untracked
+            if line.startswith(b"? "):
+                untracked_files.append(os.fsdecode(line[2:]))
+                continue
+            
+            # Ordinary ("1"), renamed/copied ("2") and unmerged ("u") entries
+            if line.startswith(b"1 "):
+                filename = os.fsdecode(line.split(b" ", 8)[8])
+            elif line.startswith(b"2 "):
+                filename = os.fsdecode(line.split(b" ", 9)[9].split(b"\t", 1)[0])
+            elif line.startswith(b"u "):
+                filename = os.fsdecode(line.split(b" ", 10)[10])
+                conflicts.append(filename)
+            else:
+                continue
             
             # Staged (first character)
-            if status_code[0] != " ":
+            if line[2:3] != b".":
                 staged_changes.append(filename)
             
             # Unstaged (second character)
-            if status_code[1] != " ":
+            if line[3:4] != b".":
                 unstaged_changes.append(filename)
-            
-            # Untracked
-            if status_code == "??":
-                untracked_files.append(filename)
-            
-            # Conflicts
-            if status_code in ["DD", "AU", "UD", "UA", "DD", "AA", "UU"]:
-                conflicts.append(filename)
+        
+        if commits_ahead is None:
+            # No upstream configured: count against origin/<branch> instead
+            commits_ahead = 0
+            ahead_result = subprocess.run(
+                ["git", "rev-list", "--count", f"origin/{current_branch}..HEAD"],
+                cwd=repo_path,
+                capture_output=True
+            )
+            if ahead_result.returncode == 0:
+                try:
+                    commits_ahead = int(ahead_result.stdout.strip() or 0)
+                except ValueError:
+                    pass
         
         is_clean = (
             not staged_changes and 
             not unstaged_changes and 
+            not untracked_files and
             not conflicts and
             commits_ahead == 0
         )
@@ -161,20 +342,9 @@ class GitTools:
             Dict with success status and staged files count
         """
         if exclude_patterns is None:
-            exclude_patterns = [
-                "*.class",
-                "*.jar",
-                "target/",
-                "build/",
-                "dist/",
-                "__pycache__/",
-                "*.pyc",
-                ".pytest_cache/",
-                ".venv/",
-                "node_modules/",
-                ".coverage",
-                "*.egg-info/"
-            ]
+            dir_prefixes, suffixes, substrings, glob_regex = _DEFAULT_DIR, _DEFAULT_SUF, _DEFAULT_SUB, None
+        else:
+            dir_prefixes, suffixes, substrings, glob_regex = _compile_exclude_patterns(exclude_patterns)
         
         try:
             # Get current status first
@@ -182,44 +352,48 @@ class GitTools:
                 ["git", "status", "--porcelain"],
                 cwd=repo_path,
                 capture_output=True,
-                text=True,
                 check=True
             )
             
             files_to_add = []
-            for line in status_result.stdout.strip().split("\n"):
+            for line in status_result.stdout.split(b"\n"):
                 if not line:
                     continue
                 
-                filename = line[3:]
+                filename = os.fsdecode(line[3:])
                 
                 # Skip if matches exclude patterns
-                skip = False
-                for pattern in exclude_patterns:
-                    if pattern.endswith("/"):
-                        if filename.startswith(pattern):
-                            skip = True
-                            break
-                    elif pattern.startswith("*"):
-                        if filename.endswith(pattern[1:]):
-                            skip = True
-                            break
-                    elif pattern in filename:
-                        skip = True
-                        break
+                if (
+                    filename.startswith(dir_prefixes) or
+                    filename.endswith(suffixes) or
+                    any(sub in filename for sub in substrings) or
+                    (glob_regex is not None and glob_regex.search(filename))
+                ):
+                    continue
                 
-                if not skip:
-                    files_to_add.append(filename)
+                files_to_add.append(filename)
             
-            # Add files
+            # Add files with a single git invocation
             if files_to_add:
-                for filename in files_to_add:
+                try:
                     subprocess.run(
-                        ["git", "add", filename],
+                        ["git", "add", "--pathspec-from-file=-", "--"],
+                        input=b"\n".join(map(os.fsencode, files_to_add)),
                         cwd=repo_path,
                         check=True,
                         capture_output=True
                     )
+                except subprocess.CalledProcessError as e:
+                    # 129 is git's usage error: --pathspec-from-file needs git 2.25+
+                    if e.returncode != 129:
+                        raise
+                    for start in range(0, len(files_to_add), _GIT_ADD_CHUNK_SIZE):
+                        subprocess.run(
+                            ["git", "add", "--"] + files_to_add[start:start + _GIT_ADD_CHUNK_SIZE],
+                            cwd=repo_path,
+                            check=True,
+                            capture_output=True
+                        )
             
             return {
                 "success": True,
@@ -258,17 +432,8 @@ class GitTools:
             full_message = message
             
             if coverage_stats:
-                stats_lines = "\n\nCoverage Update:"
-                if "line_coverage" in coverage_stats:
-                    stats_lines += f"\n- Line Coverage: {coverage_stats['line_coverage']:.2f}%"
-                if "branch_coverage" in coverage_stats:
-                    stats_lines += f"\n- Branch Coverage: {coverage_stats['branch_coverage']:.2f}%"
-                if "tests_generated" in coverage_stats:
-                    stats_lines += f"\n- Tests Generated: {coverage_stats['tests_generated']}"
-                if "coverage_gap" in coverage_stats:
-                    stats_lines += f"\n- Coverage Gap: {coverage_stats['coverage_gap']:.2f}%"
-                
-                full_message += stats_lines
+                stats = _format_stats(coverage_stats, "Coverage Update:", _COMMIT_STATS_FIELDS)
+                full_message = f"{message}\n\n{stats}"
             
             # Commit
             result = subprocess.run(
@@ -279,15 +444,20 @@ class GitTools:
             )
             
             if result.returncode == 0:
-                # Extract commit hash
-                hash_result = subprocess.run(
-                    ["git", "rev-parse", "HEAD"],
-                    cwd=repo_path,
-                    capture_output=True,
-                    text=True,
-                    check=True
-                )
-                commit_hash = hash_result.stdout.strip()[:7]
+                # Read the hash from the commit summary line, only asking git
+                # again if the output is not in the expected (C locale) form
+                match = _COMMIT_SUMMARY_RE.search(result.stdout)
+                if match:
+                    commit_hash = match.group(1)[:7]
+                else:
+                    hash_result = subprocess.run(
+                        ["git", "rev-parse", "HEAD"],
+                        cwd=repo_path,
+                        capture_output=True,
+                        text=True,
+                        check=True
+                    )
+                    commit_hash = hash_result.stdout.strip()[:7]
                 
                 return GitCommitResult(
                     success=True,
@@ -329,14 +499,7 @@ class GitTools:
         try:
             # Get current branch if not specified
             if branch is None:
-                branch_result = subprocess.run(
-                    ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-                    cwd=repo_path,
-                    capture_output=True,
-                    text=True,
-                    check=True
-                )
-                branch = branch_result.stdout.strip()
+                branch = _current_branch(repo_path)
             
             # Push with upstream configuration
             push_result = subprocess.run(
@@ -397,14 +560,8 @@ class GitTools:
         Returns:
             PullRequestResult with URL and number
         """
-        try:
-            # Check if gh is installed
-            subprocess.run(
-                ["gh", "--version"],
-                capture_output=True,
-                check=True
-            )
-        except (subprocess.CalledProcessError, FileNotFoundError):
+        # Check if gh is installed
+        if not _gh_available():
             return PullRequestResult(
                 success=False,
                 url=None,
@@ -415,14 +572,7 @@ class GitTools:
         
         try:
             # Get current branch
-            branch_result = subprocess.run(
-                ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-                cwd=repo_path,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            current_branch = branch_result.stdout.strip()
+            current_branch = _current_branch(repo_path)
             
             if current_branch == base:
                 return PullRequestResult(
@@ -435,17 +585,8 @@ class GitTools:
             # Build PR body
             full_body = body
             if coverage_stats:
-                stats_section = "\n## Coverage Improvements\n"
-                if "line_coverage" in coverage_stats:
-                    stats_section += f"- Line Coverage: {coverage_stats['line_coverage']:.2f}%\n"
-                if "branch_coverage" in coverage_stats:
-                    stats_section += f"- Branch Coverage: {coverage_stats['branch_coverage']:.2f}%\n"
-                if "tests_generated" in coverage_stats:
-                    stats_section += f"- Tests Generated: {coverage_stats['tests_generated']}\n"
-                if "coverage_improvement" in coverage_stats:
-                    stats_section += f"- Coverage Improvement: +{coverage_stats['coverage_improvement']:.2f}%\n"
-                
-                full_body += stats_section
+                stats = _format_stats(coverage_stats, "## Coverage Improvements", _PR_STATS_FIELDS)
+                full_body = f"{body}\n{stats}\n"
             
             # Create PR
             pr_result = subprocess.run(
@@ -1,6 +1,13 @@
 """MCP Server for JaCoCo Test Generator."""
 
+import asyncio
+import functools
 import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from operator import attrgetter
 from pathlib import Path
 from typing import Any
 
@@ -11,244 +18,310 @@ try:
 except ImportError:
     HAS_MCP = False
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 from .coverage_parser import JaCoCoParser, CoverageReport
 from .test_generator import JavaTestGenerator, GeneratedTest
 from .git_tools import GitTools
 
 
-def create_server():
-    """Create and configure the MCP server."""
-    if not HAS_MCP:
-        raise ImportError("MCP library not installed. Install with: pip install mcp")
-    
-    server = Server("jacoco-test-generator")
-    
-    @server.list_tools()
-    def list_tools() -> list[Tool]:
-        """List available tools."""
-        return [
-            Tool(
-                name="parse_jacoco_report",
-                description="Parse a JaCoCo XML coverage report and extract coverage gaps",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "report_path": {
-                            "type": "string",
-                            "description": "Path to the JaCoCo XML report file"
-                        }
-                    },
-                    "required": ["report_path"]
-                }
-            ),
-            Tool(
-                name="generate_tests",
-                description="Generate Java tests to cover uncovered code paths",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "report_path": {
-                            "type": "string",
-                            "description": "Path to the JaCoCo XML report file"
-                        },
-                        "max_tests_per_gap": {
-                            "type": "integer",
-                            "description": "Maximum number of tests to generate per coverage gap",
-                            "default": 3
-                        }
+# Tool definitions are static, so they are built once at import rather than
+# on every list_tools request
+if HAS_MCP:
+    _TOOLS = [
+        Tool(
+            name="parse_jacoco_report",
+            description="Parse a JaCoCo XML coverage report and extract coverage gaps",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "report_path": {
+                        "type": "string",
+                        "description": "Path to the JaCoCo XML report file"
+                    }
+                },
+                "required": ["report_path"]
+            }
+        ),
+        Tool(
+            name="generate_tests",
+            description="Generate Java tests to cover uncovered code paths",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "report_path": {
+                        "type": "string",
+                        "description": "Path to the JaCoCo XML report file"
                     },
-                    "required": ["report_path"]
-                }
-            ),
-            Tool(
-                name="get_coverage_summary",
-                description="Get a summary of coverage and top uncovered areas",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "report_path": {
-                            "type": "string",
-                            "description": "Path to the JaCoCo XML report file"
-                        },
-                        "top_n": {
-                            "type": "integer",
-                            "description": "Number of top gaps to return",
-                            "default": 10
-                        }
+                    "max_tests_per_gap": {
+                        "type": "integer",
+                        "description": "Maximum number of tests to generate per coverage gap",
+                        "default": 3
+                    }
+                },
+                "required": ["report_path"]
+            }
+        ),
+        Tool(
+            name="get_coverage_summary",
+            description="Get a summary of coverage and top uncovered areas",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "report_path": {
+                        "type": "string",
+                        "description": "Path to the JaCoCo XML report file"
                     },
-                    "required": ["report_path"]
-                }
-            ),
-            Tool(
-                name="git_status",
-                description="Check git repository status: clean status, staged changes, conflicts",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "repo_path": {
-                            "type": "string",
-                            "description": "Path to git repository",
-                            "default": "."
-                        }
+                    "top_n": {
+                        "type": "integer",
+                        "description": "Number of top gaps to return",
+                        "default": 10
+                    }
+                },
+                "required": ["report_path"]
+            }
+        ),
+        Tool(
+            name="git_status",
+            description="Check git repository status: clean status, staged changes, conflicts",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "repo_path": {
+                        "type": "string",
+                        "description": "Path to git repository",
+                        "default": "."
                     }
                 }
-            ),
-            Tool(
-                name="git_add_all",
-                description="Stage all changes with intelligent filtering (excludes build artifacts)",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "repo_path": {
-                            "type": "string",
-                            "description": "Path to git repository",
-                            "default": "."
-                        }
+            }
+        ),
+        Tool(
+            name="git_add_all",
+            description="Stage all changes with intelligent filtering (excludes build artifacts)",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "repo_path": {
+                        "type": "string",
+                        "description": "Path to git repository",
+                        "default": "."
                     }
                 }
-            ),
-            Tool(
-                name="git_commit",
-                description="Create commit with standardized message including coverage statistics",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "repo_path": {
-                            "type": "string",
-                            "description": "Path to git repository",
-                            "default": "."
-                        },
-                        "message": {
-                            "type": "string",
-                            "description": "Commit message"
-                        },
-                        "coverage_stats": {
-                            "type": "object",
-                            "description": "Coverage metrics (line_coverage, branch_coverage, tests_generated)"
-                        }
+            }
+        ),
+        Tool(
+            name="git_commit",
+            description="Create commit with standardized message including coverage statistics",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "repo_path": {
+                        "type": "string",
+                        "description": "Path to git repository",
+                        "default": "."
                     },
-                    "required": ["message"]
-                }
-            ),
-            Tool(
-                name="git_push",
-                description="Push to remote with upstream configuration",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "repo_path": {
-                            "type": "string",
-                            "description": "Path to git repository",
-                            "default": "."
-                        },
-                        "remote": {
-                            "type": "string",
-                            "description": "Remote name",
-                            "default": "origin"
-                        },
-                        "branch": {
-                            "type": "string",
-                            "description": "Branch to push (default: current branch)"
-                        }
+                    "message": {
+                        "type": "string",
+                        "description": "Commit message"
+                    },
+                    "coverage_stats": {
+                        "type": "object",
+                        "description": "Coverage metrics (line_coverage, branch_coverage, tests_generated)"
+                    }
+                },
+                "required": ["message"]
+            }
+        ),
+        Tool(
+            name="git_push",
+            description="Push to remote with upstream configuration",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "repo_path": {
+                        "type": "string",
+                        "description": "Path to git repository",
+                        "default": "."
+                    },
+                    "remote": {
+                        "type": "string",
+                        "description": "Remote name",
+                        "default": "origin"
+                    },
+                    "branch": {
+                        "type": "string",
+                        "description": "Branch to push (default: current branch)"
                     }
                 }
-            ),
-            Tool(
-                name="git_pull_request",
-                description="Create pull request (requires gh CLI installed and authenticated)",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "repo_path": {
-                            "type": "string",
-                            "description": "Path to git repository",
-                            "default": "."
-                        },
-                        "base": {
-                            "type": "string",
-                            "description": "Base branch for PR",
-                            "default": "main"
-                        },
-                        "title": {
-                            "type": "string",
-                            "description": "PR title"
-                        },
-                        "body": {
-                            "type": "string",
-                            "description": "PR description"
-                        },
-                        "coverage_stats": {
+            }
+        ),
+        Tool(
+            name="git_pull_request",
+            description="Create pull request (requires gh CLI installed and authenticated)",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "repo_path": {
+                        "type": "string",
+                        "description": "Path to git repository",
+                        "default": "."
+                    },
+                    "base": {
+                        "type": "string",
+                        "description": "Base branch for PR",
+                        "default": "main"
+                    },
+                    "title": {
+                        "type": "string",
+                        "description": "PR title"
+                    },
+                    "body": {
+                        "type": "string",
+                        "description": "PR description"
+                    },
+                    "coverage_stats": {
+                        "type": "object",
+                        "description": "Coverage metrics to include in PR"
+                    }
+                },
+                "required": ["title"]
+            }
+        ),
+        Tool(
+            name="batch_execute",
+            description="Run several tool calls in one request; each report is parsed once "
+                        "and consecutive read-only calls run concurrently",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "calls": {
+                        "type": "array",
+                        "description": "Tool calls to run, in order",
+                        "items": {
                             "type": "object",
-                            "description": "Coverage metrics to include in PR"
+                            "properties": {
+                                "name": {
+                                    "type": "string",
+                                    "description": "Tool name"
+                                },
+                                "arguments": {
+                                    "type": "object",
+                                    "description": "Tool arguments"
+                                }
+                            },
+                            "required": ["name"]
                         }
                     },
-                    "required": ["title"]
-                }
-            )
-        ]
+                    "max_concurrent": {
+                        "type": "integer",
+                        "description": "Maximum number of calls to run at the same time",
+                        "default": 4
+                    }
+                },
+                "required": ["calls"]
+            }
+        )
+    ]
+else:
+    _TOOLS = []
+
+
+def create_server():
+    """Create and configure the MCP server."""
+    if not HAS_MCP:
+        raise ImportError("MCP library not installed. Install with: pip install mcp")
+    
+    server = Server("jacoco-test-generator")
+    
+    @server.list_tools()
+    def list_tools() -> list[Tool]:
+        """List available tools."""
+        return _TOOLS
     
     @server.call_tool()
-    def call_tool(name: str, arguments: dict) -> Any:
+    async def call_tool(name: str, arguments: dict) -> list[TextContent]:
         """Handle tool calls."""
-        try:
-            if name == "parse_jacoco_report":
-                return handle_parse_report(arguments["report_path"])
-            elif name == "generate_tests":
-                return handle_generate_tests(
-                    arguments["report_path"],
-                    arguments.get("max_tests_per_gap", 3)
-                )
-            elif name == "get_coverage_summary":
-                return handle_coverage_summary(
-                    arguments["report_path"],
-                    arguments.get("top_n", 10)
-                )
-            elif name == "git_status":
-                return handle_git_status(arguments.get("repo_path", "."))
-            elif name == "git_add_all":
-                return handle_git_add_all(arguments.get("repo_path", "."))
-            elif name == "git_commit":
-                return handle_git_commit(
-                    arguments.get("repo_path", "."),
-                    arguments["message"],
-                    arguments.get("coverage_stats")
-                )
-            elif name == "git_push":
-                return handle_git_push(
-                    arguments.get("repo_path", "."),
-                    arguments.get("remote", "origin"),
-                    arguments.get("branch")
-                )
-            elif name == "git_pull_request":
-                return handle_git_pull_request(
-                    arguments.get("repo_path", "."),
-                    arguments.get("base", "main"),
-                    arguments["title"],
-                    arguments.get("body", ""),
-                    arguments.get("coverage_stats")
-                )
-            else:
-                return {"error": f"Unknown tool: {name}"}
-        except Exception as e:
-            return {"error": str(e)}
+        if name not in _HANDLERS:
+            return _unknown_tool_response(name)
+        
+        # Handlers parse XML or wait on git subprocesses; run them off the
+        # event loop so concurrent tool calls overlap instead of queueing
+        result = await asyncio.to_thread(dispatch_tool, name, arguments)
+        return [TextContent(type="text", text=to_json(result))]
     
     return server
 
 
+def to_json(payload: Any) -> str:
+    """Serialize a tool result, with orjson when it is installed."""
+    if HAS_ORJSON:
+        return orjson.dumps(payload).decode()
+    return json.dumps(payload)
+
+
+@functools.lru_cache(maxsize=32)
+def _unknown_tool_response(name: str) -> list:
+    """Build the unknown-tool error once per name; the reply never changes."""
+    return [TextContent(type="text", text=to_json({"error": f"Unknown tool: {name}"}))]
+
+
+def dispatch_tool(name: str, arguments: dict) -> Any:
+    """Route a tool call to its handler."""
+    handler = _HANDLERS.get(name)
+    if handler is None:
+        return {"error": f"Unknown tool: {name}"}
+    try:
+        # call_tool runs handlers on worker threads and batch_execute runs
+        # read-only calls concurrently; either way, repository changes never overlap
+        if name in _READ_ONLY_TOOLS or name == "batch_execute":
+            return handler(arguments)
+        with _REPO_LOCK:
+            return handler(arguments)
+    except Exception as e:
+        return {"error": str(e)}
+
+
+# Tools that take a report_path, and tools that never modify the repository
+_REPORT_TOOLS = frozenset({"parse_jacoco_report", "generate_tests", "get_coverage_summary"})
+_READ_ONLY_TOOLS = _REPORT_TOOLS | {"git_status"}
+
+# Held by every tool call that may change the repository (batch_execute
+# itself is exempt; its calls take the lock one by one through dispatch_tool)
+_REPO_LOCK = threading.Lock()
+
+
+@functools.lru_cache(maxsize=16)
+def _cached_parse(report_path: str, mtime_ns: int, size: int) -> CoverageReport:
+    """Parse a report once per (path, mtime, size); a rewritten report gets a new key."""
+    return JaCoCoParser.parse_report(report_path)
+
+
+def _load_report(report_path: str) -> CoverageReport:
+    """Get the parsed report, reusing the result of earlier tool calls on the same file."""
+    stat = os.stat(report_path)
+    return _cached_parse(report_path, stat.st_mtime_ns, stat.st_size)
+
+
 def handle_parse_report(report_path: str) -> dict:
     """Handle parse_jacoco_report tool call."""
     try:
-        report = JaCoCoParser.parse_report(report_path)
+        report = _load_report(report_path)
         
-        gaps_data = []
-        for gap in report.gaps[:20]:  # Return top 20 gaps
-            gaps_data.append({
+        _round = round  # local lookup, called twice per gap
+        gaps_data = [
+            {
                 "class_name": gap.class_name,
                 "method_name": gap.method_name,
-                "line_coverage": round(gap.line_coverage, 2),
-                "branch_coverage": round(gap.branch_coverage, 2),
-                "uncovered_lines": gap.uncovered_lines[:5]  # First 5 uncovered lines
-            })
+                "line_coverage": _round(gap.line_coverage, 2),
+                "branch_coverage": _round(gap.branch_coverage, 2),
+                "uncovered_lines": list(islice(gap.uncovered_lines, 5))  # First 5 uncovered lines
+            }
+            for gap in report.gaps[:20]  # Return top 20 gaps
+        ]
         
         return {
             "success": True,
@@ -261,24 +334,22 @@ def handle_parse_report(report_path: str) -> dict:
         return {"success": False, "error": str(e)}
 
 
+# Response keys for generated tests, paired with the GeneratedTest fields they expose
+_TEST_KEYS = ("test_class", "test_method", "target_class", "target_method", "test_code")
+_test_fields = attrgetter("class_name", "test_method_name", "target_class", "target_method", "test_code")
+
+
 def handle_generate_tests(report_path: str, max_tests_per_gap: int) -> dict:
     """Handle generate_tests tool call."""
     try:
         # Parse report
-        report = JaCoCoParser.parse_report(report_path)
+        report = _load_report(report_path)
         
         # Generate tests
         tests = JavaTestGenerator.generate_tests(report.gaps, max_tests_per_gap)
         
-        tests_data = []
-        for test in tests[:10]:  # Return first 10 generated tests
-            tests_data.append({
-                "test_class": test.class_name,
-                "test_method": test.test_method_name,
-                "target_class": test.target_class,
-                "target_method": test.target_method,
-                "test_code": test.test_code
-            })
+        # Return first 10 generated tests
+        tests_data = [dict(zip(_TEST_KEYS, _test_fields(test))) for test in islice(tests, 10)]
         
         return {
             "success": True,
@@ -292,16 +363,18 @@ def handle_generate_tests(report_path: str, max_tests_per_gap: int) -> dict:
 def handle_coverage_summary(report_path: str, top_n: int) -> dict:
     """Handle get_coverage_summary tool call."""
     try:
-        report = JaCoCoParser.parse_report(report_path)
+        report = _load_report(report_path)
         
-        gaps_data = []
-        for gap in report.gaps[:top_n]:
-            gaps_data.append({
+        _round = round  # local lookup, called twice per gap
+        gaps_data = [
+            {
                 "class_name": gap.class_name,
                 "method_name": gap.method_name,
-                "line_coverage_percent": round(gap.line_coverage, 2),
-                "branch_coverage_percent": round(gap.branch_coverage, 2)
-            })
+                "line_coverage_percent": _round(gap.line_coverage, 2),
+                "branch_coverage_percent": _round(gap.branch_coverage, 2)
+            }
+            for gap in report.gaps[:top_n]
+        ]
         
         return {
             "success": True,
@@ -317,6 +390,57 @@ def handle_coverage_summary(report_path: str, top_n: int) -> dict:
         return {"success": False, "error": str(e)}
 
 
+def handle_batch_execute(calls: list, max_concurrent: int = 4) -> dict:
+    """Handle batch_execute tool call."""
+    try:
+        # Parse every referenced report up front so concurrent calls share one parse
+        report_paths = {
+            call.get("arguments", {}).get("report_path")
+            for call in calls
+            if call.get("name") in _REPORT_TOOLS
+        }
+        for report_path in report_paths:
+            try:
+                _load_report(report_path)
+            except Exception:
+                pass  # Reported by the individual calls
+        
+        results = [None] * len(calls)
+        
+        def run(index: int) -> None:
+            call = calls[index]
+            name = call.get("name")
+            if name == "batch_execute":
+                results[index] = {"error": "batch_execute cannot be nested"}
+            else:
+                results[index] = dispatch_tool(name, call.get("arguments", {}))
+        
+        # Consecutive read-only calls run concurrently; calls that change the
+        # repository run alone, in order
+        with ThreadPoolExecutor(max_workers=max(1, max_concurrent)) as executor:
+            pending = []
+            for index, call in enumerate(calls):
+                if call.get("name") in _READ_ONLY_TOOLS:
+                    pending.append(executor.submit(run, index))
+                    continue
+                for future in pending:
+                    future.result()
+                pending = []
+                run(index)
+            for future in pending:
+                future.result()
+        
+        return {
+            "success": True,
+            "results": [
+                {"name": call.get("name"), "result": result}
+                for call, result in zip(calls, results)
+            ]
+        }
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
 def handle_git_status(repo_path: str) -> dict:
     """Handle git_status tool call."""
     try:
@@ -384,11 +508,47 @@ def handle_git_pull_request(
         return {"success": False, "error": str(e)}
 
 
+# Tool name -> adapter unpacking the call arguments (with defaults) for its handler
+_HANDLERS = {
+    "parse_jacoco_report": lambda a: handle_parse_report(a["report_path"]),
+    "generate_tests": lambda a: handle_generate_tests(
+        a["report_path"],
+        a.get("max_tests_per_gap", 3)
+    ),
+    "get_coverage_summary": lambda a: handle_coverage_summary(
+        a["report_path"],
+        a.get("top_n", 10)
+    ),
+    "git_status": lambda a: handle_git_status(a.get("repo_path", ".")),
+    "git_add_all": lambda a: handle_git_add_all(a.get("repo_path", ".")),
+    "git_commit": lambda a: handle_git_commit(
+        a.get("repo_path", "."),
+        a["message"],
+        a.get("coverage_stats")
+    ),
+    "git_push": lambda a: handle_git_push(
+        a.get("repo_path", "."),
+        a.get("remote", "origin"),
+        a.get("branch")
+    ),
+    "git_pull_request": lambda a: handle_git_pull_request(
+        a.get("repo_path", "."),
+        a.get("base", "main"),
+        a["title"],
+        a.get("body", ""),
+        a.get("coverage_stats")
+    ),
+    "batch_execute": lambda a: handle_batch_execute(
+        a["calls"],
+        a.get("max_concurrent", 4)
+    ),
+}
+
+
 def main():
     """Entry point for the MCP server."""
     server = create_server()
     
-    import asyncio
     from mcp.server.stdio import stdio_server
     
     async def run():
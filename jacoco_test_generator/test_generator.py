@@ -1,18 +1,58 @@
 """Generate Java test cases from coverage gaps."""
 
+import functools
+from itertools import chain, islice
 from typing import List
 from dataclasses import dataclass
 from .coverage_parser import CoverageGap
 
 
-@dataclass
+_TEST_TEMPLATE = """    @Test
+    public void test{method_cap}Case{case}() {{
+        <scenario>
+        // TODO: Implement test logic to cover uncovered lines: {uncovered_lines}
+        
+        // Arrange
+        {class_name} instance = new {class_name}();
+        
+        // Act
+        // Call method that covers the uncovered code paths
+        
+        // Assert
+        // Verify expected behavior
+    }}"""
+
+# One pre-built template per test scenario, picked by test index
+_TEMPLATES = tuple(
+    _TEST_TEMPLATE.replace("<scenario>", scenario)
+    for scenario in (
+        "// Test with normal inputs",
+        "// Test with edge case inputs",
+        "// Test with boundary values"
+    )
+)
+
+
+@dataclass(frozen=True)
 class GeneratedTest:
     """Represents a generated test case."""
+    # Declared by hand rather than dataclass(slots=True), which needs Python 3.10
+    __slots__ = ("class_name", "test_method_name", "test_code", "target_class", "target_method")
+    
     class_name: str
     test_method_name: str
     test_code: str
     target_class: str
     target_method: str
+    
+    # Frozen dataclasses with hand-written __slots__ get no pickle support:
+    # the default __setstate__ assigns attributes, which frozen forbids
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+    
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
 
 
 class JavaTestGenerator:
@@ -30,70 +70,48 @@ class JavaTestGenerator:
         Returns:
             List of generated test cases
         """
-        tests = []
-        
-        for i, gap in enumerate(gaps[:10]):  # Focus on top 10 gaps
-            method_tests = JavaTestGenerator._generate_tests_for_method(gap, max_tests_per_gap)
-            tests.extend(method_tests)
-        
-        return tests
+        return list(chain.from_iterable(
+            JavaTestGenerator._generate_tests_for_method(gap, max_tests_per_gap)
+            for gap in islice(gaps, 10)  # Focus on top 10 gaps
+        ))
     
     @staticmethod
     def _generate_tests_for_method(gap: CoverageGap, num_tests: int) -> List[GeneratedTest]:
         """Generate test cases for a specific method."""
-        tests = []
         test_class_name = JavaTestGenerator._get_test_class_name(gap.class_name)
         
-        for i in range(num_tests):
-            test_method_name = f"test{gap.method_name.split('(')[0].capitalize()}_Case{i+1}"
-            test_code = JavaTestGenerator._generate_test_code(gap, i)
-            
-            test = GeneratedTest(
+        method_name = gap.method_base
+        method_cap = method_name[:1].upper() + method_name[1:]
+        
+        return [
+            GeneratedTest(
                 class_name=test_class_name,
-                test_method_name=test_method_name,
-                test_code=test_code,
+                test_method_name=f"test{method_cap}_Case{i+1}",
+                test_code=JavaTestGenerator._generate_test_code(gap, i, method_cap),
                 target_class=gap.class_name,
                 target_method=gap.method_name
             )
-            tests.append(test)
-        
-        return tests
+            for i in range(num_tests)
+        ]
     
     @staticmethod
-    def _generate_test_code(gap: CoverageGap, test_index: int) -> str:
-        
-        method_name = gap.method_name.split("(")[0]
+    def _generate_test_code(gap: CoverageGap, test_index: int, method_cap: str) -> str:
         
         # Different test scenarios based on index
-        scenarios = [
-            "// Test with normal inputs",
-            "// Test with edge case inputs",
-            "// Test with boundary values"
-        ]
-        
-        scenario = scenarios[test_index % len(scenarios)]
-        
-        test_code = f"""    @Test
-    public void test{method_name.capitalize()}Case{test_index + 1}() {{
-        {scenario}
-        // TODO: Implement test logic to cover uncovered lines: {', '.join(map(str, gap.uncovered_lines[:3]))}
-        
-        // Arrange
-        {gap.class_name} instance = new {gap.class_name}();
-        
-        // Act
-        // Call method that covers the uncovered code paths
-        
-        // Assert
-        // Verify expected behavior
-    }}"""
-        
-        return test_code
+        template = _TEMPLATES[test_index % len(_TEMPLATES)]
+        
+        return template.format_map({
+            "method_cap": method_cap,
+            "case": test_index + 1,
+            "uncovered_lines": ", ".join(map(str, gap.uncovered_lines[:3])),
+            "class_name": gap.class_name
+        })
     
     @staticmethod
+    @functools.lru_cache(maxsize=256)
     def _get_test_class_name(target_class: str) -> str:
-        """Generate test class name from target class."""
-        simple_name = target_class.split(".")[-1]
+        """Generate test class name from target class (memoized, gaps share classes)."""
+        simple_name = target_class.rsplit(".", 1)[-1]
         return f"{simple_name}Test"
     
     @staticmethod
@@ -109,9 +127,12 @@ class JavaTestGenerator:
         Returns:
             Complete Java test file content
         """
-        unique_tests = {t.test_method_name: t for t in tests}
-        
-        test_methods = "\n\n".join(t.test_code for t in unique_tests.values())
+        # Skip repeated method names (e.g. overloads); the first one wins
+        seen = set()
+        test_methods = "\n\n".join([
+            t.test_code for t in tests
+            if not (t.test_method_name in seen or seen.add(t.test_method_name))
+        ])
         
         file_content = f"""package {package_name}.test;
 
@@ -0,0 +1,44 @@
+"""Checks for the git_add_all exclude pattern categories."""
+
+from jacoco_test_generator.git_tools import _compile_exclude_patterns
+
+
+def test_patterns_are_sorted_into_categories():
+    dir_prefixes, suffixes, substrings, glob_regex = _compile_exclude_patterns(
+        ["target/", "*.class", "*.egg-info/", ".coverage"]
+    )
+    
+    assert dir_prefixes == ("target/",)
+    assert suffixes == (".class",)
+    assert substrings == (".egg-info/", ".coverage")
+    assert glob_regex is None
+
+
+def test_glob_matches_file_names_at_any_depth():
+    *_, glob_regex = _compile_exclude_patterns(["test_*.py"])
+    
+    assert glob_regex.search("test_a.py")
+    assert glob_regex.search("src/test_a.py")
+    assert not glob_regex.search("src/latest_a.py")
+    assert not glob_regex.search("a/test_dir/x.py")
+
+
+def test_glob_does_not_cross_directories():
+    *_, glob_regex = _compile_exclude_patterns(["src/*.tmp", "?.log", "[!a]b.txt"])
+    
+    assert glob_regex.search("src/x.tmp")
+    assert not glob_regex.search("src/sub/x.tmp")
+    assert not glob_regex.search("lib/src/x.tmp")
+    assert glob_regex.search("logs/a.log")
+    assert not glob_regex.search("ab.log")
+    assert glob_regex.search("cb.txt")
+    assert not glob_regex.search("ab.txt")
+    assert not glob_regex.search("x/b.txt")
+
+
+def test_directory_glob_excludes_everything_below():
+    *_, glob_regex = _compile_exclude_patterns(["build-*/"])
+    
+    assert glob_regex.search("build-1/out.jar")
+    assert glob_regex.search("app/build-debug/")
+    assert not glob_regex.search("build-notes.txt")
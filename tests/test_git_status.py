@@ -0,0 +1,62 @@
+"""Checks for git_status parsing of porcelain v2 output."""
+
+import shutil
+import subprocess
+
+import pytest
+
+from jacoco_test_generator.git_tools import GitTools
+
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+
+def git(repo, *args):
+    subprocess.run(["git", *args], cwd=repo, capture_output=True, check=True)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    git(tmp_path, "init", "-q", "-b", "main")
+    git(tmp_path, "config", "user.email", "test@example.com")
+    git(tmp_path, "config", "user.name", "Test")
+    (tmp_path / "a.txt").write_text("one\ntwo\nthree\n")
+    git(tmp_path, "add", "a.txt")
+    git(tmp_path, "commit", "-q", "-m", "initial")
+    return tmp_path
+
+
+def test_rename_reports_new_path(repo):
+    git(repo, "mv", "a.txt", "b.txt")
+    
+    status = GitTools.git_status(str(repo))
+    
+    assert status.staged_changes == ["b.txt"]
+    assert status.unstaged_changes == []
+    assert not status.is_clean
+
+
+def test_conflict_is_reported(repo):
+    git(repo, "checkout", "-q", "-b", "other")
+    (repo / "a.txt").write_text("other\n")
+    git(repo, "commit", "-q", "-am", "other")
+    git(repo, "checkout", "-q", "main")
+    (repo / "a.txt").write_text("main\n")
+    git(repo, "commit", "-q", "-am", "main")
+    subprocess.run(["git", "merge", "-q", "other"], cwd=repo, capture_output=True)
+    
+    status = GitTools.git_status(str(repo))
+    
+    assert status.conflicts == ["a.txt"]
+    assert status.current_branch == "main"
+
+
+def test_commits_ahead_without_upstream_uses_origin_branch(repo):
+    git(repo, "update-ref", "refs/remotes/origin/main", "HEAD")
+    (repo / "a.txt").write_text("changed\n")
+    git(repo, "commit", "-q", "-am", "ahead")
+    
+    status = GitTools.git_status(str(repo))
+    
+    assert status.commits_ahead == 1
+    assert not status.is_clean
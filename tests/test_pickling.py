@@ -0,0 +1,39 @@
+"""Round-trip checks for the slotted result dataclasses."""
+
+import copy
+import pickle
+from pathlib import Path
+
+import pytest
+
+from jacoco_test_generator.coverage_parser import JaCoCoParser
+from jacoco_test_generator.test_generator import JavaTestGenerator
+
+
+REPORT_PATH = Path(__file__).resolve().parent.parent / "assignment3_jacoco_report.xml"
+
+
+@pytest.fixture(scope="module")
+def report():
+    return JaCoCoParser.parse_report(str(REPORT_PATH))
+
+
+@pytest.mark.parametrize("round_trip", [
+    lambda obj: pickle.loads(pickle.dumps(obj)),
+    copy.copy,
+    copy.deepcopy,
+], ids=["pickle", "copy", "deepcopy"])
+def test_gap_and_generated_test_round_trip(report, round_trip):
+    gap = report.gaps[0]
+    test = JavaTestGenerator.generate_tests(report.gaps)[0]
+    
+    assert round_trip(gap) == gap
+    assert round_trip(test) == test
+
+
+def test_report_pickle_round_trip(report):
+    restored = pickle.loads(pickle.dumps(report))
+    
+    assert restored.gaps == report.gaps
+    assert restored.total_gaps == report.total_gaps
+    assert restored.total_line_coverage == report.total_line_coverage